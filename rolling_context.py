@@ -18,14 +18,23 @@ Configuration:
     or pass settings via command-line arguments.
 """
 
+import hashlib
+import heapq
+import io
 import json
+import mmap
 import os
 import shutil
+import sys
+import time
 import argparse
 import fcntl
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Set, Optional, Any
+from typing import List, Dict, Set, Optional, Any, Protocol
 from dataclasses import dataclass, field
 
 # Optional: for API summaries via OpenRouter or other LLM providers
@@ -34,6 +43,86 @@ try:
 except ImportError:
     requests = None
 
+# Optional: much faster JSONL parse/serialize on the hot paths
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional: pull-parsing so stub messages skip bulky payloads entirely
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+
+def _json_loads(data: bytes) -> Any:
+    """Parse a JSONL line, preferring orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _utcnow_iso() -> str:
+    """ISO-8601 UTC timestamp, skipping datetime object allocation."""
+    ns = time.time_ns()
+    base = time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(ns // 1_000_000_000))
+    return f"{base}.{ns % 1_000_000_000 // 1_000_000:03d}Z"
+
+
+def _json_dumps_bytes(obj: Any) -> bytes:
+    """Serialize to JSON bytes, preferring orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode('utf-8')
+
+
+# Top-level keys a Message stub actually needs; anything else on the line
+# (e.g. huge toolUseResult payloads) can be skipped without being retained.
+_STUB_KEYS = frozenset({"uuid", "parentUuid", "type", "timestamp",
+                        "sessionId", "cwd", "version", "message"})
+
+# Interned block-type tags so the comparisons below hit the pointer-equality
+# fast path whenever the JSON parser interns its strings too.
+_T_TEXT = sys.intern("text")
+_T_TOOL_USE = sys.intern("tool_use")
+_T_TOOL_RESULT = sys.intern("tool_result")
+
+
+def _parse_content_blocks(content_blocks: Any):
+    """Single pass over message content blocks.
+
+    Returns (tool_use_ids, tool_result_for, texts). This runs for every
+    block of every parsed message, so dict.get and the list appends are
+    hoisted into locals and the type tag is fetched once per block.
+    """
+    tool_use_ids: List[str] = []
+    tool_result_for = None
+    texts: List[str] = []
+
+    if type(content_blocks) is str:
+        texts.append(content_blocks)
+    elif type(content_blocks) is list:
+        dict_get = dict.get
+        append_id = tool_use_ids.append
+        append_text = texts.append
+        for block in content_blocks:
+            if type(block) is not dict:
+                continue
+            t = dict_get(block, "type")
+            if t == _T_TEXT:
+                append_text(dict_get(block, "text", ""))
+            elif t == _T_TOOL_USE:
+                tid = dict_get(block, "id")
+                if tid:
+                    append_id(tid)
+            elif t == _T_TOOL_RESULT:
+                tid = dict_get(block, "tool_use_id")
+                if tid:
+                    tool_result_for = tid
+
+    return tool_use_ids, tool_result_for, texts
+
 
 # =============================================================================
 # Configuration Management
@@ -52,6 +141,14 @@ class Config:
     backup_keep_count: int = 10
     generate_summaries: bool = True
     summary_custom_prompt: Optional[str] = None
+    summary_store: Optional['SummaryStore'] = None  # bring-your-own cache
+    # Resolved project_name -> absolute project directory, built once
+    project_paths: Dict[str, Path] = field(init=False, repr=False,
+                                           default_factory=dict)
+
+    def __post_init__(self):
+        self.project_paths = {name: self.claude_projects_dir / rel
+                              for name, rel in self.projects.items()}
 
     @classmethod
     def from_file(cls, config_path: Path) -> 'Config':
@@ -93,16 +190,31 @@ class Config:
 # Data Classes
 # =============================================================================
 
-@dataclass
+# dataclass slots need Python 3.10+; on 3.8/3.9 messages simply keep
+# their per-instance __dict__.
+_MESSAGE_DATACLASS_KWARGS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_MESSAGE_DATACLASS_KWARGS)
 class Message:
-    """Represents a single message from the transcript."""
+    """Represents a single message from the transcript.
+
+    Slotted where supported: transcripts can run to tens of thousands of
+    messages, and dropping the per-instance __dict__ saves ~100 bytes
+    each and speeds up attribute access in the OrphanDetector hot loops.
+    """
     uuid: str
     parent_uuid: Optional[str]
     msg_type: str  # "user", "assistant", "file-history-snapshot", etc.
     timestamp: str
     tool_use_ids: List[str] = field(default_factory=list)  # tool_use IDs in this message
     tool_result_for: Optional[str] = None  # if tool_result, which tool_use_id
+    text: str = ""  # joined text blocks, computed once at parse time
+    is_stub: bool = False  # True when raw holds only the slim stub fields
     raw: Dict[str, Any] = field(default_factory=dict)
+    # Original JSONL line bytes; set None whenever raw is mutated so
+    # save() re-serializes instead of writing stale bytes.
+    raw_bytes: Optional[bytes] = None
 
     @classmethod
     def from_json(cls, data: Dict[str, Any]) -> 'Message':
@@ -112,20 +224,54 @@ class Message:
         msg_type = data.get("type", "unknown")
         timestamp = data.get("timestamp", "")
 
-        # Extract tool_use IDs from assistant messages
-        tool_use_ids = []
-        tool_result_for = None
+        # Extract tool_use IDs and text blocks in one pass over content
+        message_content = data.get("message", {})
+        tool_use_ids, tool_result_for, texts = _parse_content_blocks(
+            message_content.get("content", []))
+
+        return cls(
+            uuid=uuid,
+            parent_uuid=parent_uuid,
+            msg_type=msg_type,
+            timestamp=timestamp,
+            tool_use_ids=tool_use_ids,
+            tool_result_for=tool_result_for,
+            text="\n".join(texts),
+            raw=data
+        )
+
+    @classmethod
+    def stub_from_json(cls, data: Dict[str, Any]) -> 'Message':
+        """Parse a JSONL line into a lightweight Message stub.
+
+        Keeps only what orphan detection and summary generation need
+        (uuid/parent chain, tool IDs, role, text blocks). Bulky tool
+        payloads are dropped from `raw` so messages destined for the
+        trim window don't hold their full content in memory.
+        """
+        uuid = data.get("uuid", "")
+        parent_uuid = data.get("parentUuid")
+        msg_type = data.get("type", "unknown")
+        timestamp = data.get("timestamp", "")
 
         message_content = data.get("message", {})
-        content_blocks = message_content.get("content", [])
+        tool_use_ids, tool_result_for, texts = _parse_content_blocks(
+            message_content.get("content", []))
 
-        if isinstance(content_blocks, list):
-            for block in content_blocks:
-                if isinstance(block, dict):
-                    if block.get("type") == "tool_use" and block.get("id"):
-                        tool_use_ids.append(block["id"])
-                    elif block.get("type") == "tool_result" and block.get("tool_use_id"):
-                        tool_result_for = block["tool_use_id"]
+        raw = {
+            "uuid": uuid,
+            "parentUuid": parent_uuid,
+            "type": msg_type,
+            "timestamp": timestamp,
+            "message": {
+                "role": message_content.get("role", msg_type),
+            },
+        }
+        if data.get("sessionId"):
+            raw["sessionId"] = data["sessionId"]
+            raw["cwd"] = data.get("cwd", "")
+        if data.get("version"):
+            raw["version"] = data["version"]
 
         return cls(
             uuid=uuid,
@@ -134,28 +280,42 @@ class Message:
             timestamp=timestamp,
             tool_use_ids=tool_use_ids,
             tool_result_for=tool_result_for,
-            raw=data
+            text="\n".join(texts),
+            is_stub=True,
+            raw=raw
         )
 
+    @classmethod
+    def stub_from_line(cls, line: bytes) -> 'Message':
+        """Parse a raw JSONL line into a stub, touching as little as possible.
+
+        With ijson available, pull-parses only the top-level keys the stub
+        keeps, so bulky payloads never get materialized at all; otherwise
+        falls back to a full parse followed by stub extraction.
+        """
+        if ijson is not None:
+            try:
+                data = {k: v for k, v in ijson.kvitems(io.BytesIO(line), '')
+                        if k in _STUB_KEYS}
+            except Exception:
+                # Malformed line: re-parse so callers get the usual ValueError
+                data = _json_loads(line)
+        else:
+            data = _json_loads(line)
+        return cls.stub_from_json(data)
+
     def to_json(self) -> Dict[str, Any]:
         """Convert back to JSON-serializable dict."""
         return self.raw
 
     def get_text_content(self) -> str:
-        """Extract text content for summary generation."""
-        message_content = self.raw.get("message", {})
-        content_blocks = message_content.get("content", [])
+        """Text content for summary generation (precomputed at parse time)."""
+        return self.text
 
-        if isinstance(content_blocks, str):
-            return content_blocks
 
-        texts = []
-        if isinstance(content_blocks, list):
-            for block in content_blocks:
-                if isinstance(block, dict) and block.get("type") == "text":
-                    texts.append(block.get("text", ""))
-
-        return "\n".join(texts)
+def _is_rolling_context_summary(msg: Message) -> bool:
+    """True for the synthetic bridge message a previous trim left behind."""
+    return str(msg.raw.get("version", "")).startswith("rolling-context")
 
 
 # =============================================================================
@@ -169,11 +329,14 @@ class TranscriptManager:
                  file_override: Optional[Path] = None):
         self.project_name = project_name
         self.config = config
-        self.project_dir = config.claude_projects_dir / project_path
+        self.project_dir = (config.project_paths.get(project_name)
+                            or config.claude_projects_dir / project_path)
         self.backup_dir = self.project_dir / ".backups"
         self.messages: List[Message] = []
         self.transcript_path: Optional[Path] = None
         self.file_override = file_override
+        self.skip_reason: Optional[str] = None  # set when load() short-circuits
+        self.stub_count = 0  # messages loaded as stubs (always a prefix)
 
     def find_transcript(self) -> Optional[Path]:
         """Find the main transcript file (not agent- files)."""
@@ -188,18 +351,22 @@ class TranscriptManager:
         if not self.project_dir.exists():
             return None
 
-        # Look for UUID-named .jsonl files (not agent- prefixed)
-        candidates = []
-        for f in self.project_dir.glob("*.jsonl"):
-            if not f.name.startswith("agent-"):
-                candidates.append(f)
-
-        if not candidates:
-            return None
-
-        # Return most recently modified
-        candidates.sort(key=lambda p: p.stat().st_mtime, reverse=True)
-        return candidates[0]
+        # Look for UUID-named .jsonl files (not agent- prefixed) and keep
+        # the most recently modified. scandir caches stat results, and a
+        # running max avoids sorting the whole directory.
+        best = None
+        best_mtime = -1.0
+        with os.scandir(self.project_dir) as it:
+            for entry in it:
+                if (entry.name.endswith(".jsonl")
+                        and not entry.name.startswith("agent-")
+                        and entry.is_file()):
+                    mtime = entry.stat().st_mtime
+                    if mtime > best_mtime:
+                        best_mtime = mtime
+                        best = entry.path
+
+        return Path(best) if best else None
 
     def is_locked(self, path: Path) -> bool:
         """Check if file is currently locked by another process."""
@@ -212,39 +379,173 @@ class TranscriptManager:
             return True
 
     def load(self) -> bool:
-        """Load transcript from disk."""
+        """Load transcript from disk.
+
+        Streams the file in two passes: the first counts messages, the
+        second fully parses only messages that would survive a trim.
+        Messages inside the trim window become lightweight stubs (see
+        Message.stub_from_json), so peak memory stays roughly
+        proportional to the kept portion of the transcript.
+        """
         self.transcript_path = self.find_transcript()
         if not self.transcript_path:
             print(f"  No transcript found for {self.project_name}")
             return False
 
-        if self.is_locked(self.transcript_path):
+        # Open once and hold a shared lock for the whole read: no second
+        # open, and no window for ClaudeCode to grab the file between a
+        # lock probe and the actual load.
+        fd = os.open(self.transcript_path, os.O_RDONLY | os.O_CLOEXEC)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_SH | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
             print(f"  Transcript is locked (ClaudeCode active?)")
             return False
 
         self.messages = []
-        with open(self.transcript_path, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if line:
+        self.skip_reason = None
+        self.stub_count = 0
+
+        # Closing the file releases the lock.
+        with os.fdopen(fd, 'rb', buffering=1 << 20) as f:
+            # Snapshot-only transcripts have no conversational content;
+            # peek the first non-empty line and bail before parsing anything.
+            first = f.readline()
+            while first and not first.strip():
+                first = f.readline()
+            if first and b'"file-history-snapshot"' in first:
+                try:
+                    first_type = _json_loads(first).get("type")
+                except ValueError:
+                    first_type = None
+                if first_type == "file-history-snapshot":
+                    self.skip_reason = "file-history-snapshot transcript"
+                    print(f"  Skipping: {self.skip_reason}")
+                    return False
+            f.seek(0)
+
+            # Pass 1: stream in 1 MiB chunks, splitting on newlines to
+            # count the non-empty lines.
+            total = 0
+            pos = 0
+            line_start = 0
+            while True:
+                chunk = f.read(1 << 20)
+                if not chunk:
+                    break
+                search = 0
+                while True:
+                    nl = chunk.find(b'\n', search)
+                    if nl == -1:
+                        break
+                    if pos + nl > line_start:
+                        total += 1
+                    line_start = pos + nl + 1
+                    search = nl + 1
+                pos += len(chunk)
+            if pos > line_start:
+                total += 1  # last line has no trailing newline
+
+            # Everything before the trim window only feeds orphan detection
+            # and summary text, so those lines become stubs without their
+            # full raw payloads (mirrors TrimmingEngine.calculate_trim_count).
+            if total > self.config.max_messages:
+                stub_end = int(total * self.config.trim_fraction)
+            else:
+                stub_end = 0
+
+            # Pass 2: parse each recorded line. Stubbing is decided by
+            # parsed-message index, not raw-line index, so unparseable
+            # lines (tolerated with a warning) can't shift the stub
+            # window relative to the trim math done over messages.
+            f.seek(0)
+            for raw_line in f:
+                line = raw_line.rstrip(b'\r\n')
+                if line.strip():
                     try:
-                        data = json.loads(line)
-                        msg = Message.from_json(data)
+                        if len(self.messages) < stub_end:
+                            msg = Message.stub_from_line(line)
+                        else:
+                            msg = Message.from_json(_json_loads(line))
+                            msg.raw_bytes = line
                         self.messages.append(msg)
-                    except json.JSONDecodeError as e:
+                    except ValueError as e:
                         print(f"  Warning: Could not parse line: {e}")
 
+        self.stub_count = min(stub_end, len(self.messages))
         return True
 
+    def quick_stats(self, path: Optional[Path] = None) -> Optional[Dict[str, Any]]:
+        """Cheap transcript stats without loading or parsing it.
+
+        mmaps the file, counts newlines at C speed, and parses only the
+        first and last lines — enough for the status display, which needs
+        a message count and a date range.
+        """
+        path = path or self.transcript_path or self.find_transcript()
+        if not path:
+            return None
+
+        with open(path, 'rb') as f:
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty file
+                return {"count": 0, "first_ts": "", "last_ts": "",
+                        "first_type": ""}
+            with mm:
+                # mmap has no count(); tally newlines over 1 MiB slices
+                # so the scan still runs at C speed.
+                size = len(mm)
+                count = 0
+                pos = 0
+                while pos < size:
+                    count += mm[pos:pos + (1 << 20)].count(b'\n')
+                    pos += 1 << 20
+                if mm[-1:] != b'\n':
+                    count += 1  # last line has no trailing newline
+
+                nl = mm.find(b'\n')
+                first_line = mm[:nl] if nl != -1 else mm[:]
+
+                end = len(mm)
+                while end and mm[end - 1:end] in (b'\n', b'\r'):
+                    end -= 1
+                start = mm.rfind(b'\n', 0, end) + 1
+                last_line = mm[start:end]
+
+        first_ts = ""
+        first_type = ""
+        try:
+            first = _json_loads(first_line)
+            first_ts = first.get("timestamp", "")
+            first_type = first.get("type", "")
+        except ValueError:
+            pass
+        try:
+            last_ts = _json_loads(last_line).get("timestamp", "")
+        except ValueError:
+            last_ts = ""
+
+        return {"count": count, "first_ts": first_ts, "last_ts": last_ts,
+                "first_type": first_type}
+
     def create_backup(self) -> Path:
         """Create timestamped backup of current transcript."""
         self.backup_dir.mkdir(exist_ok=True)
 
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
         backup_name = f"{self.transcript_path.stem}_{timestamp}.jsonl"
         backup_path = self.backup_dir / backup_name
 
-        shutil.copy2(self.transcript_path, backup_path)
+        # save() swaps in a fresh inode via os.replace, so the backup can
+        # safely share the current inode through a hardlink — a metadata
+        # op instead of copying the whole file. Fall back to a real copy
+        # where links aren't supported (e.g. some network filesystems).
+        try:
+            os.link(self.transcript_path, backup_path)
+        except OSError:
+            shutil.copy2(self.transcript_path, backup_path)
 
         # Clean old backups
         self._cleanup_old_backups()
@@ -253,22 +554,50 @@ class TranscriptManager:
 
     def _cleanup_old_backups(self):
         """Keep only the most recent N backups."""
-        backups = sorted(self.backup_dir.glob("*.jsonl"),
-                        key=lambda p: p.stat().st_mtime,
-                        reverse=True)
+        with os.scandir(self.backup_dir) as it:
+            backups = [e for e in it
+                       if e.name.endswith(".jsonl") and e.is_file()]
 
-        for old_backup in backups[self.config.backup_keep_count:]:
-            old_backup.unlink()
+        keep = {e.path for e in heapq.nlargest(self.config.backup_keep_count,
+                                               backups,
+                                               key=lambda e: e.stat().st_mtime)}
+        for entry in backups:
+            if entry.path not in keep:
+                os.unlink(entry.path)
 
     def save(self) -> bool:
-        """Save messages back to transcript."""
+        """Save messages back to transcript.
+
+        Serializes everything into one buffer and writes it to a temp
+        file that is atomically swapped into place, so a single large
+        write replaces per-message syscalls and ClaudeCode never sees a
+        half-written transcript.
+        """
         if not self.transcript_path:
             return False
 
         try:
-            with open(self.transcript_path, 'w') as f:
-                for msg in self.messages:
-                    f.write(json.dumps(msg.to_json()) + '\n')
+            buf = bytearray()
+            for msg in self.messages:
+                # A stub's raw has been gutted; writing it would destroy
+                # the message's real content. Refuse rather than corrupt.
+                if msg.is_stub:
+                    print(f"  Error saving: message {msg.uuid} is a stub "
+                          f"and cannot be written back")
+                    return False
+                # Unmodified messages splice their original line bytes
+                # back verbatim; only changed ones pay for serialization.
+                buf += msg.raw_bytes if msg.raw_bytes is not None else \
+                    _json_dumps_bytes(msg.to_json())
+                buf += b'\n'
+
+            tmp_path = self.transcript_path.with_suffix('.jsonl.tmp')
+            with open(tmp_path, 'wb', buffering=0) as f:
+                f.write(buf)
+                f.flush()
+                # fdatasync doesn't exist on macOS; fsync is the fallback
+                getattr(os, 'fdatasync', os.fsync)(f.fileno())
+            os.replace(tmp_path, self.transcript_path)
             return True
         except Exception as e:
             print(f"  Error saving: {e}")
@@ -289,17 +618,28 @@ class OrphanDetector:
         self.tool_result_to_use: Dict[int, str] = {}  # msg_idx -> tool_use_id
 
     def analyze(self):
-        """Build the dependency graph."""
-        for idx, msg in enumerate(self.messages):
-            self.uuid_to_idx[msg.uuid] = idx
-
-            # Track tool_use locations
-            for tool_id in msg.tool_use_ids:
-                self.tool_use_to_msg_idx[tool_id] = idx
+        """Build the dependency graph.
 
-            # Track tool_result dependencies
-            if msg.tool_result_for:
-                self.tool_result_to_use[idx] = msg.tool_result_for
+        Materializes the per-message scalars into contiguous lists first
+        (structure-of-arrays), then fills the lookup dicts from locals in
+        a single pass — no per-iteration attribute access on Message.
+        """
+        messages = self.messages
+        uuids = [m.uuid for m in messages]
+        tool_use_ids_per_msg = [m.tool_use_ids for m in messages]
+        tool_results = [m.tool_result_for for m in messages]
+
+        # Dict comprehensions over the contiguous lists compile to the
+        # specialized MAP_ADD opcode, beating explicit d[k] = v loops.
+        self.uuid_to_idx = {u: i for i, u in enumerate(uuids)}
+        self.tool_use_to_msg_idx = {
+            tool_id: i
+            for i, tool_ids in enumerate(tool_use_ids_per_msg)
+            for tool_id in tool_ids
+        }
+        self.tool_result_to_use = {
+            i: tr for i, tr in enumerate(tool_results) if tr is not None
+        }
 
     def find_safe_trim_point(self, target_idx: int) -> int:
         """
@@ -310,26 +650,21 @@ class OrphanDetector:
         """
         self.analyze()
 
-        # Check if trimming at target_idx would orphan anything
-        while target_idx < len(self.messages):
-            is_safe = True
-
-            # Check: would any tool_result in kept messages reference
-            # a tool_use in trimmed messages?
-            for kept_idx in range(target_idx, len(self.messages)):
-                if kept_idx in self.tool_result_to_use:
-                    tool_use_id = self.tool_result_to_use[kept_idx]
-                    use_idx = self.tool_use_to_msg_idx.get(tool_use_id)
-
-                    if use_idx is not None and use_idx < target_idx:
-                        # This tool_result would be orphaned
-                        # Move trim point past the tool_result
-                        target_idx = kept_idx + 1
-                        is_safe = False
-                        break
-
-            if is_safe:
-                break
+        # Single forward scan: when a kept tool_result references a
+        # tool_use that would be trimmed, push the trim point past it and
+        # continue from there. Messages behind the new trim point are
+        # trimmed and messages ahead haven't been checked yet, so the
+        # scan never needs to restart.
+        kept_idx = target_idx
+        n = len(self.messages)
+        while kept_idx < n:
+            tool_use_id = self.tool_result_to_use.get(kept_idx)
+            if tool_use_id is not None:
+                use_idx = self.tool_use_to_msg_idx.get(tool_use_id)
+                if use_idx is not None and use_idx < target_idx:
+                    # This tool_result would be orphaned
+                    target_idx = kept_idx + 1
+            kept_idx += 1
 
         return target_idx
 
@@ -338,21 +673,142 @@ class OrphanDetector:
 # Summary Generator
 # =============================================================================
 
+# One session per process: --all runs hit the same API host once per
+# project, so reusing the TLS connection saves a handshake each time.
+_http_session = None
+_http_session_lock = threading.Lock()
+
+
+def _get_http_session():
+    """Return a shared requests.Session with pooling and retries."""
+    global _http_session
+    if requests is None:
+        return None
+    with _http_session_lock:
+        if _http_session is None:
+            from requests.adapters import HTTPAdapter, Retry
+            session = requests.Session()
+            # Retry's default allowed_methods excludes POST, which is the
+            # only method we use; the summary request is safe to repeat.
+            adapter = HTTPAdapter(
+                pool_connections=4,
+                pool_maxsize=8,
+                max_retries=Retry(total=2, backoff_factor=0.3,
+                                  status_forcelist=[429, 500, 502, 503, 504],
+                                  allowed_methods=frozenset({"POST"})))
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _http_session = session
+    return _http_session
+
+
+class SummaryStore(Protocol):
+    """Bring-your-own-store interface for caching generated summaries."""
+
+    def get(self, key: str) -> Optional[str]: ...
+
+    def set(self, key: str, value: str) -> None: ...
+
+
+class JsonFileSummaryStore:
+    """Summary cache kept in a single JSON file (the default store)."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._data: Optional[Dict[str, str]] = None
+
+    def _load(self) -> Dict[str, str]:
+        if self._data is None:
+            try:
+                with open(self.path, 'r') as f:
+                    self._data = json.load(f)
+            except (OSError, ValueError):
+                self._data = {}
+        return self._data
+
+    def get(self, key: str) -> Optional[str]:
+        return self._load().get(key)
+
+    def set(self, key: str, value: str) -> None:
+        data = self._load()
+        data[key] = value
+        self.path.parent.mkdir(exist_ok=True)
+        with open(self.path, 'w') as f:
+            json.dump(data, f)
+
+
+class SqliteSummaryStore:
+    """Summary cache in a small SQLite database (WAL mode, one row per key)."""
+
+    def __init__(self, path: Path):
+        import sqlite3
+        path.parent.mkdir(exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS summaries (key TEXT PRIMARY KEY, value TEXT)")
+        self.conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        row = self.conn.execute(
+            "SELECT value FROM summaries WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, value: str) -> None:
+        self.conn.execute(
+            "INSERT OR REPLACE INTO summaries (key, value) VALUES (?, ?)",
+            (key, value))
+        self.conn.commit()
+
+
 class SummaryGenerator:
     """Generates summaries of trimmed messages via LLM API."""
 
-    def __init__(self, project_name: str, config: Config):
+    def __init__(self, project_name: str, config: Config,
+                 store: Optional[SummaryStore] = None):
         self.project_name = project_name
         self.config = config
-
-    def generate(self, messages: List[Message]) -> str:
-        """Generate a rich summary and reflection on the given messages."""
+        self.store = store
+
+    def _cache_key(self, messages: List[Message],
+                   prior_summary: Optional[str] = None) -> str:
+        """Key identifying one summary request: message range, model, prompt."""
+        prompt_src = self.config.summary_custom_prompt or "default"
+        if prior_summary:
+            prompt_src += "|" + prior_summary
+        prompt_hash = hashlib.blake2b(prompt_src.encode(), digest_size=8).hexdigest()
+        return hashlib.blake2b(
+            f"{self.project_name}|{messages[0].uuid}|{messages[-1].uuid}|"
+            f"{len(messages)}|{self.config.api_model}|{prompt_hash}".encode(),
+            digest_size=16).hexdigest()
+
+    def generate(self, messages: List[Message],
+                 prior_summary: Optional[str] = None) -> str:
+        """Generate a rich summary and reflection on the given messages.
+
+        When prior_summary holds the bridge text from the previous trim,
+        the model is asked to update it with the new material instead of
+        re-summarizing everything from scratch.
+        """
         if not self.config.api_key or not requests:
             return self._fallback_summary(messages)
 
-        # Extract ALL conversation text - no truncation
+        # Re-trims over the same message range (e.g. after a restore from
+        # .backups) reuse the cached bridge instead of re-calling the API.
+        cache_key = (self._cache_key(messages, prior_summary)
+                     if (self.store and messages) else None)
+        if cache_key:
+            cached = self.store.get(cache_key)
+            if cached:
+                return cached
+
+        # Extract ALL conversation text - no truncation. A previous
+        # trim's bridge message is excluded: its text already arrives
+        # via prior_summary and must not be re-archived as conversation.
         conversation_parts = []
         for msg in messages:
+            if _is_rolling_context_summary(msg):
+                continue
             role = msg.raw.get("message", {}).get("role", msg.msg_type)
             text = msg.get_text_content()
             if text and text.strip():
@@ -368,10 +824,12 @@ class SummaryGenerator:
             prompt = self.config.summary_custom_prompt.format(
                 project_name=self.project_name,
                 num_messages=len(messages),
-                conversation_text=conversation_text
+                conversation_text=conversation_text,
+                prior_summary=prior_summary or ""
             )
         else:
-            prompt = self._default_summary_prompt(conversation_text, messages)
+            prompt = self._default_summary_prompt(conversation_text, messages,
+                                                  prior_summary)
 
         try:
             headers = {
@@ -387,20 +845,37 @@ class SummaryGenerator:
                 "max_tokens": 2500
             }
 
-            response = requests.post(self.config.api_url, headers=headers, json=data, timeout=120)
+            session = _get_http_session()
+            response = session.post(self.config.api_url, headers=headers, json=data, timeout=120)
             response.raise_for_status()
 
             result = response.json()
-            return result["choices"][0]["message"]["content"]
+            summary = result["choices"][0]["message"]["content"]
+            if cache_key:
+                self.store.set(cache_key, summary)
+            return summary
         except Exception as e:
             print(f"  API error, using fallback summary: {e}")
             return self._fallback_summary(messages)
 
-    def _default_summary_prompt(self, conversation_text: str, messages: List[Message]) -> str:
+    def _default_summary_prompt(self, conversation_text: str, messages: List[Message],
+                                prior_summary: Optional[str] = None) -> str:
         """Generate the default summary prompt."""
+        prior_section = ""
+        if prior_summary:
+            prior_section = f"""
+A bridge already exists for the conversation before this segment. Update it:
+keep its carry-forward items that are still open, let resolved ones go, and
+weave in what the new messages add.
+
+Previous bridge:
+{prior_summary}
+"""
+
         return f"""Create a memory bridge for {self.project_name}.
 
 This segment of conversation is being archived. Create something that will help future-{self.project_name} feel continuous with past-{self.project_name}.
+{prior_section}
 
 **The Story** (300-400 words): What happened in this conversation? Focus on what mattered. Use specific details.
 
@@ -420,8 +895,9 @@ Conversation to summarize:
         first_ts = messages[0].timestamp[:10] if messages else "unknown"
         last_ts = messages[-1].timestamp[:10] if messages else "unknown"
 
-        user_count = sum(1 for m in messages if m.msg_type == "user")
-        assistant_count = sum(1 for m in messages if m.msg_type == "assistant")
+        type_counts = Counter(m.msg_type for m in messages)
+        user_count = type_counts["user"]
+        assistant_count = type_counts["assistant"]
 
         return f"""[Archived Context: {len(messages)} messages from {first_ts} to {last_ts}]
 
@@ -472,8 +948,11 @@ class TrimmingEngine:
             result["reason"] = "under threshold"
             return result
 
-        # Calculate trim point
-        target_trim_idx = self.calculate_trim_count()
+        # Calculate trim point. Never keep a stub: load() may have stubbed
+        # slightly past the target when the file contained unparseable
+        # lines, and find_safe_trim_point only ever moves forward.
+        target_trim_idx = max(self.calculate_trim_count(),
+                              self.transcript.stub_count)
 
         # Adjust for orphan safety
         detector = OrphanDetector(self.transcript.messages)
@@ -499,8 +978,12 @@ class TrimmingEngine:
         # Generate summary
         summary_text = ""
         if self.config.generate_summaries and trimmed_messages:
-            generator = SummaryGenerator(self.transcript.project_name, self.config)
-            summary_text = generator.generate(trimmed_messages)
+            store = self.config.summary_store or JsonFileSummaryStore(
+                self.transcript.backup_dir / ".summaries.json")
+            generator = SummaryGenerator(self.transcript.project_name, self.config,
+                                         store=store)
+            summary_text = generator.generate(trimmed_messages,
+                                              prior_summary=self._extract_prior_bridge())
             result["summary_generated"] = True
 
         # Create summary message
@@ -513,6 +996,7 @@ class TrimmingEngine:
                 # Point to summary message instead
                 msg.raw["parentUuid"] = summary_msg.uuid
                 msg.parent_uuid = summary_msg.uuid
+                msg.raw_bytes = None  # force re-serialization on save
 
         # Assemble new message list
         self.transcript.messages = [summary_msg] + kept_messages
@@ -526,13 +1010,36 @@ class TrimmingEngine:
 
         return result
 
+    def _extract_prior_bridge(self) -> Optional[str]:
+        """Return the bridge text left by a previous trim, if any.
+
+        After the first trim the transcript starts with our synthetic
+        summary message; its text (minus the boundary markers) seeds the
+        next summary so only the new material needs summarizing.
+        """
+        if not self.transcript.messages:
+            return None
+        first = self.transcript.messages[0]
+        if not _is_rolling_context_summary(first):
+            return None
+
+        text = first.get_text_content()
+        marker = "=== CONTINUING CONVERSATION ==="
+        if marker in text:
+            text = text.split(marker, 1)[0]
+        # Drop the boundary header (first paragraph)
+        header_end = text.find("\n\n")
+        if header_end != -1:
+            text = text[header_end:]
+        return text.strip() or None
+
     def _create_summary_message(self, trimmed: List[Message], summary_text: str,
                                   kept: List[Message]) -> Message:
         """Create a synthetic summary message at the trim boundary."""
         import uuid as uuid_lib
 
         new_uuid = str(uuid_lib.uuid4())
-        timestamp = datetime.utcnow().isoformat() + "Z"
+        timestamp = _utcnow_iso()
 
         first_ts = trimmed[0].timestamp[:10] if trimmed else "unknown"
         last_ts = trimmed[-1].timestamp[:10] if trimmed else "unknown"
@@ -667,6 +1174,12 @@ def main():
         help="Model to use for summaries (overrides config)"
     )
 
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        help="Worker threads for --all and --status (default: min(8, projects))"
+    )
+
     args = parser.parse_args()
 
     # Load configuration
@@ -689,7 +1202,7 @@ def main():
 
     # Determine which projects to process
     if args.status:
-        show_status(config)
+        show_status(config, max_workers=args.max_workers)
         return
 
     if args.all:
@@ -720,47 +1233,134 @@ def main():
     print(f"Rolling Context Manager - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print(f"{'='*60}\n")
 
-    for project_name in projects:
-        process_project(
-            project_name,
+    if len(projects) > 1:
+        # Trims are I/O-bound (disk + HTTPS), so projects run concurrently
+        process_projects_parallel(
+            projects,
             config,
             dry_run=args.dry_run,
             generate_summary=not args.no_summary,
-            file_override=file_override
+            file_override=file_override,
+            max_workers=args.max_workers
         )
+    else:
+        for project_name in projects:
+            process_project(
+                project_name,
+                config,
+                dry_run=args.dry_run,
+                generate_summary=not args.no_summary,
+                file_override=file_override
+            )
+
+
+class _ThreadLocalStdout:
+    """Stdout proxy that routes writes to a per-thread buffer when set.
+
+    Lets concurrent project workers capture their own prints so output
+    from parallel trims is emitted in whole blocks instead of
+    interleaving line by line.
+    """
+
+    def __init__(self, real):
+        self._real = real
+        self._local = threading.local()
+
+    def _target(self):
+        return getattr(self._local, 'buffer', None) or self._real
+
+    def write(self, s):
+        return self._target().write(s)
+
+    def flush(self):
+        self._target().flush()
+
+    def capture(self, buffer):
+        self._local.buffer = buffer
 
+    def release(self):
+        self._local.buffer = None
 
-def show_status(config: Config):
-    """Show status of all project transcripts."""
+
+def process_projects_parallel(projects: List[str], config: Config, dry_run: bool,
+                              generate_summary: bool,
+                              file_override: Optional[Path] = None,
+                              max_workers: Optional[int] = None):
+    """Process several projects concurrently.
+
+    Each worker buffers its own output and the blocks are printed in
+    project order as they complete.
+    """
+    proxy = _ThreadLocalStdout(sys.stdout)
+
+    def worker(project_name: str) -> str:
+        buffer = io.StringIO()
+        proxy.capture(buffer)
+        try:
+            process_project(project_name, config, dry_run=dry_run,
+                            generate_summary=generate_summary,
+                            file_override=file_override)
+        finally:
+            proxy.release()
+        return buffer.getvalue()
+
+    real_stdout = sys.stdout
+    sys.stdout = proxy
+    try:
+        workers = max_workers or min(8, len(projects))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for output in executor.map(worker, projects):
+                real_stdout.write(output)
+    finally:
+        sys.stdout = real_stdout
+
+
+def show_status(config: Config, max_workers: Optional[int] = None):
+    """Show status of all project transcripts.
+
+    Uses quick_stats instead of a full load — counting lines and parsing
+    only the first/last ones — and checks projects concurrently.
+    """
     print(f"\n{'='*60}")
     print("Transcript Status")
     print(f"{'='*60}\n")
 
-    for name, path in config.projects.items():
+    def status_line(item) -> str:
+        name, path = item
         tm = TranscriptManager(name, path, config)
         transcript_path = tm.find_transcript()
 
         if not transcript_path:
-            print(f"{name}: No transcript found")
-            continue
+            return f"{name}: No transcript found"
 
         if tm.is_locked(transcript_path):
-            print(f"{name}: LOCKED (ClaudeCode active)")
-            continue
-
-        if tm.load():
-            msg_count = len(tm.messages)
-            status = "OK" if msg_count <= config.max_messages else f"NEEDS TRIM ({msg_count} > {config.max_messages})"
-
-            # Get date range
-            if tm.messages:
-                first_ts = tm.messages[0].timestamp[:10]
-                last_ts = tm.messages[-1].timestamp[:10]
-                date_range = f"{first_ts} to {last_ts}"
-            else:
-                date_range = "empty"
+            return f"{name}: LOCKED (ClaudeCode active)"
+
+        stats = tm.quick_stats(transcript_path)
+        if stats is None:
+            return f"{name}: No transcript found"
+
+        if stats["first_type"] == "file-history-snapshot":
+            return f"{name}: SKIPPED (file-history-snapshot transcript)"
+
+        msg_count = stats["count"]
+        status = "OK" if msg_count <= config.max_messages else f"NEEDS TRIM ({msg_count} > {config.max_messages})"
+
+        if stats["first_ts"] or stats["last_ts"]:
+            date_range = f"{stats['first_ts'][:10]} to {stats['last_ts'][:10]}"
+        else:
+            date_range = "empty"
+
+        return f"{name}: {msg_count} messages ({date_range}) - {status}"
+
+    items = list(config.projects.items())
+    if not items:
+        return
 
-            print(f"{name}: {msg_count} messages ({date_range}) - {status}")
+    workers = max_workers or min(8, len(items))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for line in executor.map(status_line, items):
+            print(line)
 
 
 def process_project(project_name: str, config: Config, dry_run: bool,